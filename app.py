@@ -1,33 +1,61 @@
 from flask import Flask, render_template, send_from_directory
 app = Flask(__name__, static_folder='static', template_folder='templates')
 
+# static pages: endpoint -> (template, title); rendered once at startup into RENDERED
+PAGES = {
+    'index': ('index.html', "AJMAL ADAMZ Blockchain Research & Technologies"),
+    'about': ('about.html', "About | Ajmal Adamz"),
+    'research': ('research.html', "Research | Ajmal Adamz"),
+    'knowledge': ('knowledge.html', "History of Blockchain | Ajmal Adamz"),
+    'blockchain_basic': ('blockchain_basic.html', "Blockchain Basic | Ajmal Adamz"),
+    'contact': ('contact.html', "Contact | Ajmal Adamz"),
+    'labs': ('labs.html', "🧪 Labs | Ajmal Adamz Research"),
+}
+RENDERED = {}
+
 @app.route('/')
 def index():
-    return render_template('index.html', title="AJMAL ADAMZ Blockchain Research & Technologies")
+    return RENDERED['index']
 
 @app.route('/about')
 def about():
-    return render_template('about.html', title="About | Ajmal Adamz")
+    return RENDERED['about']
 
 @app.route('/research')
 def research():
-    return render_template('research.html', title="Research | Ajmal Adamz")
+    return RENDERED['research']
 
 @app.route('/knowledge')
 def knowledge():
-    return render_template('knowledge.html', title="History of Blockchain | Ajmal Adamz")
+    return RENDERED['knowledge']
 
 @app.route('/blockchain-basic')
 def blockchain_basic():
-    return render_template('blockchain_basic.html', title="Blockchain Basic | Ajmal Adamz")
+    return RENDERED['blockchain_basic']
 
 @app.route('/contact')
 def contact():
-    return render_template('contact.html', title="Contact | Ajmal Adamz")
+    return RENDERED['contact']
 
 @app.route('/labs')
 def labs():
-    return render_template('labs.html', title="🧪 Labs | Ajmal Adamz Research")
+    return RENDERED['labs']
+
+# register reviews API (reviews_api.py is generated by setup.sh)
+try:
+    import reviews_api
+    reviews_api.init_reviews(app)
+except Exception as e:
+    # if initialization fails, still run site; /api/reviews will be unavailable
+    print("reviews_api init error:", e)
+
+def prerender_pages():
+    # templates call url_for(), so render inside a request context once all routes exist
+    with app.test_request_context('/'):
+        for endpoint, (template, title) in PAGES.items():
+            RENDERED[endpoint] = render_template(template, title=title)
+
+prerender_pages()
 
 if __name__ == '__main__':
     app.run(host='127.0.0.1', port=8080)
@@ -1,56 +1,170 @@
 #!/bin/sh
-# Ready-to-paste single script — creates/overwrites necessary files to add a secure server-backed Reviews system.
-# Paste this whole script into Termux or your server shell and run it (sh ./setup_reviews.sh).
-# It will create: reviews_api.py, app.py (full Flask app), templates/index.html (updated), templates/base.html (if missing), templates/* dirs and static dirs.
-# At the end it launches Flask (development server). If you prefer not to run automatically, remove the last two lines.
+# Single setup script — creates/overwrites necessary files to add a secure server-backed Reviews system.
+# Run it from the repo checkout at ~/mywebsite (it needs the repo's app.py): sh ./setup.sh
+# It will create: reviews_api.py (registered by the repo's app.py), wsgi.py, templates/index.html (updated), templates/base.html (if missing), templates/* dirs and static dirs.
+# At the end it launches the app under gunicorn on 127.0.0.1:8080 only: it is unreachable from outside
+# until nginx is set up with the generated nginx.local.conf (see nginx.conf). If you prefer not to run
+# automatically, remove the final gunicorn line.
 
 set -e
 
 # ensure project directories
 mkdir -p ~/mywebsite/templates ~/mywebsite/static/css ~/mywebsite/static/images
 cd ~/mywebsite
+[ -f app.py ] || { echo "app.py not found: run from the repo checkout at ~/mywebsite"; exit 1; }
 
 ##########
 # reviews_api.py
 ##########
 cat > reviews_api.py <<'PY'
+import hashlib
+import os
 import sqlite3
 import secrets
+import threading
 import time
-from flask import Blueprint, request, jsonify, current_app, g, make_response
+from flask import Blueprint, request, jsonify, current_app
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+
+    def dumps(obj):
+        return orjson.dumps(obj)
+
+    class OrjsonProvider(DefaultJSONProvider):
+        """app.json backed by orjson, so request.get_json() and jsonify skip stdlib json."""
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, default=self.default).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+except ImportError:
+    # orjson is optional; stdlib json produces the same payload, just slower
+    import json
+
+    def dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+    OrjsonProvider = None
 
 bp = Blueprint('reviews_api', __name__, url_prefix='/api/reviews')
 DB = 'reviews.db'
+# captchas are disposable: keep them in a separate file next to DB, attached as "mem",
+# shared by every thread and worker process and written without fsyncs
+CAPTCHA_DB = os.path.join(os.path.dirname(os.path.abspath(DB)), 'captchas.db')
 CAPTCHA_TTL = 300  # seconds
+CAPTCHA_SWEEP_INTERVAL = 60  # seconds
+LIST_CACHE_TTL = 2  # seconds
+_pool = threading.local()
+
+# last rendered list_reviews body; per process, invalidated on local writes and
+# checked against reviews_version before use so writes on other workers are seen
+# 'gen' is bumped on every invalidation so a read that raced a write is not stored
+_list_cache = {'ts': 0, 'gen': 0, 'limit': None, 'body': None, 'etag': None, 'version': None}
+_list_cache_lock = threading.Lock()
+
+# hot-path SQL kept as module constants so sqlite3's statement cache reuses the compiled statements
+SQL_LIST = "SELECT id,name,text,ts FROM reviews ORDER BY ts DESC LIMIT ?"
+LIST_COLS = ('id', 'name', 'text', 'ts')
+SQL_LIST_VERSION = "SELECT v FROM reviews_version WHERE id=0"
+SQL_INSERT_REVIEW = "INSERT INTO reviews(name, text, ts, client_id, delete_token) VALUES (?,?,?,?,?)"
+SQL_GET_NAME_BY_CLIENT = "SELECT name FROM reviews WHERE client_id = ? ORDER BY ts DESC LIMIT 1"
+SQL_GET_REVIEW_BY_ID = "SELECT 1 FROM reviews WHERE id=?"
+# authorize and delete in one statement (SQLite 3.35+ for RETURNING)
+SQL_DEL_REVIEW = "DELETE FROM reviews WHERE id=? AND (delete_token=? OR client_id=?) RETURNING id"
+SQL_PUT_CAPTCHA = "INSERT OR REPLACE INTO mem.captchas(cid,answer,expires_at) VALUES (?,?,?)"
+SQL_GET_CAPTCHA = "SELECT answer, expires_at FROM mem.captchas WHERE cid=?"
+SQL_DEL_CAPTCHA = "DELETE FROM mem.captchas WHERE cid=?"
+SQL_PURGE_CAPTCHAS = "DELETE FROM mem.captchas WHERE expires_at < ?"
+
+def json_response(obj, status=200):
+    """Serialize straight to bytes (orjson when available) instead of going through jsonify."""
+    return current_app.response_class(dumps(obj), status=status, mimetype='application/json')
 
 def get_db():
-    db = getattr(g, '_reviews_db', None)
+    # long-lived connection per worker thread, opened once and reused across requests
+    db = getattr(_pool, 'conn', None)
     if db is None:
-        db = sqlite3.connect(DB, check_same_thread=False)
+        db = sqlite3.connect(DB, check_same_thread=False, isolation_level=None, timeout=10,
+                             cached_statements=256)
         db.row_factory = sqlite3.Row
-        g._reviews_db = db
+        # per-connection tuning: WAL + NORMAL sync avoids an fsync per commit;
+        # reads come straight from a 256MB mmap of the file, so each thread's
+        # private page cache is not the limit (cache=shared would add table locks)
+        db.executescript("""
+        PRAGMA synchronous = NORMAL;
+        PRAGMA temp_store = MEMORY;
+        PRAGMA mmap_size = 268435456;
+        PRAGMA cache_size = -20000;
+        PRAGMA busy_timeout = 10000;
+        PRAGMA wal_autocheckpoint = 1000;
+        """)
+        db.execute("ATTACH DATABASE ? AS mem", (CAPTCHA_DB,))
+        db.executescript("""
+        PRAGMA mem.journal_mode = WAL;
+        PRAGMA mem.synchronous = OFF;
+        """)
+        _pool.conn = db
     return db
 
-def init_db():
-    db = get_db()
-    db.executescript("""
-    PRAGMA journal_mode = WAL;
-    CREATE TABLE IF NOT EXISTS reviews (
-      id INTEGER PRIMARY KEY AUTOINCREMENT,
+# id is a plain rowid alias: no AUTOINCREMENT, so inserts skip the sqlite_sequence update
+SQL_REVIEWS_TABLE = """CREATE TABLE IF NOT EXISTS {table} (
+      id INTEGER PRIMARY KEY,
       name TEXT NOT NULL,
       text TEXT NOT NULL,
       ts INTEGER NOT NULL,
       client_id TEXT,
       delete_token TEXT NOT NULL
+    )"""
+SQL_REVIEWS_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_reviews_ts ON reviews(ts DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_reviews_client_ts ON reviews(client_id, ts DESC, name)",
+)
+# every insert/delete bumps reviews_version, so each worker can tell whether its cached list is current
+SQL_REVIEWS_TRIGGERS = (
+    "CREATE TRIGGER IF NOT EXISTS trg_reviews_ins AFTER INSERT ON reviews "
+    "BEGIN UPDATE reviews_version SET v = v + 1 WHERE id=0; END",
+    "CREATE TRIGGER IF NOT EXISTS trg_reviews_del AFTER DELETE ON reviews "
+    "BEGIN UPDATE reviews_version SET v = v + 1 WHERE id=0; END",
+)
+
+def init_db():
+    db = get_db()
+    db.executescript(f"""
+    PRAGMA journal_mode = WAL;
+    {SQL_REVIEWS_TABLE.format(table='reviews')};
+    CREATE TABLE IF NOT EXISTS reviews_version (
+      id INTEGER PRIMARY KEY CHECK (id = 0),
+      v INTEGER NOT NULL
     );
-    CREATE TABLE IF NOT EXISTS captchas (
+    INSERT OR IGNORE INTO reviews_version(id, v) VALUES (0, 0);
+    DROP TABLE IF EXISTS main.captchas;
+    CREATE TABLE IF NOT EXISTS mem.captchas (
       cid TEXT PRIMARY KEY,
       answer TEXT NOT NULL,
       expires_at INTEGER NOT NULL
     );
-    CREATE INDEX IF NOT EXISTS idx_reviews_ts ON reviews(ts DESC);
     """)
-    db.commit()
+    migrate_reviews_rowid(db)
+    for sql in SQL_REVIEWS_INDEXES + SQL_REVIEWS_TRIGGERS:
+        db.execute(sql)
+
+def migrate_reviews_rowid(db):
+    """
+    One-time migration: rebuild a reviews table created with AUTOINCREMENT as a plain rowid table.
+    Runs under BEGIN IMMEDIATE so concurrently starting workers migrate at most once.
+    """
+    with db:
+        db.execute("BEGIN IMMEDIATE")
+        row = db.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name='reviews'").fetchone()
+        if 'AUTOINCREMENT' not in row[0].upper():
+            return
+        db.execute(SQL_REVIEWS_TABLE.format(table='reviews_new'))
+        db.execute("INSERT INTO reviews_new(id, name, text, ts, client_id, delete_token) "
+                   "SELECT id, name, text, ts, client_id, delete_token FROM reviews")
+        db.execute("DROP TABLE reviews")
+        db.execute("ALTER TABLE reviews_new RENAME TO reviews")
 
 @bp.route('/health', methods=['GET'])
 def health():
@@ -63,32 +177,35 @@ def get_captcha():
     Returns: { cid, question }.
     """
     db = get_db()
-    a = secrets.randbelow(8) + 2
-    b = secrets.randbelow(8) + 1
+    # one urandom read covers both operands and the captcha id
+    buf = os.urandom(14)
+    a = 2 + (buf[0] & 7)
+    b = 1 + (buf[1] & 7)
     ans = str(a + b)
-    cid = secrets.token_hex(12)
+    cid = buf[2:14].hex()
     expires = int(time.time()) + CAPTCHA_TTL
-    db.execute("INSERT OR REPLACE INTO captchas(cid,answer,expires_at) VALUES (?,?,?)", (cid, ans, expires))
-    db.commit()
-    return jsonify({'cid': cid, 'question': f"{a} + {b} = ?"}), 200
+    db.execute(SQL_PUT_CAPTCHA, (cid, ans, expires))
+    return json_response({'cid': cid, 'question': f"{a} + {b} = ?"})
 
 def verify_captcha(db, cid, answer):
-    if not cid:
+    if not cid or not isinstance(cid, str):
         return False
-    row = db.execute("SELECT answer, expires_at FROM captchas WHERE cid=?",(cid,)).fetchone()
+    row = db.execute(SQL_GET_CAPTCHA, (cid,)).fetchone()
     if not row:
         return False
     if int(time.time()) > row['expires_at']:
-        db.execute("DELETE FROM captchas WHERE cid=?", (cid,))
-        db.commit()
+        db.execute(SQL_DEL_CAPTCHA, (cid,))
         return False
     if str(answer).strip() != str(row['answer']).strip():
         return False
-    # consume captcha
-    db.execute("DELETE FROM captchas WHERE cid=?", (cid,))
-    db.commit()
+    # caller consumes the captcha in the same transaction as its write
     return True
 
+def invalidate_list_cache():
+    with _list_cache_lock:
+        _list_cache['ts'] = 0
+        _list_cache['gen'] += 1
+
 @bp.route('', methods=['GET'])
 def list_reviews():
     """
@@ -96,12 +213,35 @@ def list_reviews():
     Returns: { reviews: [ {id,name,text,ts} ... ] }
     """
     limit = int(request.args.get('limit', '200')[:4]) if request.args.get('limit') else 200
+    now = time.time()
+    with _list_cache_lock:
+        if _list_cache['limit'] == limit and now - _list_cache['ts'] < LIST_CACHE_TTL:
+            body, etag, version = _list_cache['body'], _list_cache['etag'], _list_cache['version']
+        else:
+            body = etag = version = None
+        gen = _list_cache['gen']
     db = get_db()
-    rows = db.execute("SELECT id,name,text,ts FROM reviews ORDER BY ts DESC LIMIT ?", (limit,)).fetchall()
-    reviews = []
-    for r in rows:
-        reviews.append({'id': r['id'], 'name': r['name'], 'text': r['text'], 'ts': r['ts']})
-    return jsonify({'reviews': reviews})
+    if body is not None and db.execute(SQL_LIST_VERSION).fetchone()[0] != version:
+        body = None
+    if body is None:
+        # plain tuples: skip building a sqlite3.Row per row before the dict
+        cur = db.cursor()
+        cur.row_factory = None
+        # one read snapshot, so the version always matches the rows it is stored with
+        with db:
+            cur.execute("BEGIN")
+            version = cur.execute(SQL_LIST_VERSION).fetchone()[0]
+            reviews = [dict(zip(LIST_COLS, r)) for r in cur.execute(SQL_LIST, (limit,))]
+        body = dumps({'reviews': reviews})
+        etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+        with _list_cache_lock:
+            if _list_cache['gen'] == gen:
+                _list_cache.update(ts=now, limit=limit, body=body, etag=etag, version=version)
+    resp = current_app.response_class(body, mimetype='application/json')
+    resp.set_etag(etag)
+    resp.headers['Cache-Control'] = f'public, max-age={LIST_CACHE_TTL}'
+    # answers If-None-Match with a bodyless 304
+    return resp.make_conditional(request)
 
 @bp.route('', methods=['POST'])
 def create_review():
@@ -110,15 +250,20 @@ def create_review():
     Enforces: name creation requires captcha. One name per client_id cookie.
     Returns created review and a delete_token (store client-side).
     """
-    data = request.get_json(force=True) or {}
-    name = (data.get('name') or '').strip()
-    text = (data.get('text') or '').strip()
+    data = request.get_json(silent=True)
+    # non-object JSON (e.g. a list) counts as an empty body; non-string fields as missing
+    if not isinstance(data, dict):
+        data = {}
+    name = data.get('name')
+    name = name.strip() if isinstance(name, str) else ''
+    text = data.get('text')
+    text = text.strip() if isinstance(text, str) else ''
     captcha_id = data.get('captcha_id')
     captcha_answer = data.get('captcha_answer')
 
     if not name:
         return jsonify({'error': 'name required'}), 400
-    if not text and data.get('text') is None:
+    if not text and not isinstance(data.get('text'), str):
         return jsonify({'error': 'text required'}), 400
 
     db = get_db()
@@ -129,7 +274,7 @@ def create_review():
         client_id = secrets.token_hex(16)
 
     # check if this client already created a name (prevent multiple different names)
-    row = db.execute("SELECT name FROM reviews WHERE client_id = ? ORDER BY ts DESC LIMIT 1", (client_id,)).fetchone()
+    row = db.execute(SQL_GET_NAME_BY_CLIENT, (client_id,)).fetchone()
     if row:
         existing_name = row['name']
         if existing_name != name:
@@ -143,100 +288,87 @@ def create_review():
     # create review with server-generated delete_token
     delete_token = secrets.token_urlsafe(24)
     ts = int(time.time())
-    cur = db.execute("INSERT INTO reviews(name, text, ts, client_id, delete_token) VALUES (?,?,?,?,?)",
-                     (name, text, ts, client_id, delete_token))
-    db.commit()
+    # consume captcha and insert review under a single commit
+    with db:
+        db.execute("BEGIN IMMEDIATE")
+        if not row and db.execute(SQL_DEL_CAPTCHA, (captcha_id,)).rowcount == 0:
+            # captcha was consumed by a concurrent request
+            db.rollback()
+            return jsonify({'error': 'captcha failed'}), 400
+        cur = db.execute(SQL_INSERT_REVIEW, (name, text, ts, client_id, delete_token))
+    invalidate_list_cache()
     review_id = cur.lastrowid
 
     # set client cookie so same client is recognized later
-    resp = make_response(jsonify({'id': review_id, 'delete_token': delete_token, 'name': name, 'text': text, 'ts': ts}), 201)
+    resp = json_response({'id': review_id, 'delete_token': delete_token, 'name': name, 'text': text, 'ts': ts}, 201)
     resp.set_cookie('aj_client_id', client_id, httponly=True, samesite='Lax')
     return resp
 
 @bp.route('/<int:rid>', methods=['DELETE'])
 def delete_review(rid):
     """
-    Delete requires JSON body: { delete_token: '...' } OR cookie client match.
-    If delete_token matches stored token, delete. Otherwise if request has same client_id cookie as stored, allow delete.
+    Delete requires X-Delete-Token header (or JSON body: { delete_token: '...' }) OR cookie client match.
+    The review is deleted if either the delete_token or the client_id cookie matches the stored value.
     """
-    data = request.get_json(force=True) or {}
-    token = data.get('delete_token')
-    db = get_db()
-    row = db.execute("SELECT delete_token, client_id FROM reviews WHERE id=?", (rid,)).fetchone()
-    if not row:
-        return jsonify({'error': 'not found'}), 404
-
-    # check delete_token
-    if token and secrets.compare_digest(token, row['delete_token']):
-        db.execute("DELETE FROM reviews WHERE id=?", (rid,))
-        db.commit()
-        return jsonify({'ok': True}), 200
-
-    # otherwise check client cookie
+    # header token skips parsing the body entirely
+    token = request.headers.get('X-Delete-Token')
+    if not token:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            data = {}
+        token = data.get('delete_token')
+    # either credential may match; a missing one binds NULL and never matches
     client_id = request.cookies.get('aj_client_id')
-    if client_id and client_id == row['client_id']:
-        db.execute("DELETE FROM reviews WHERE id=?", (rid,))
-        db.commit()
+    db = get_db()
+    # non-string JSON values (lists, objects) can't be bound and never match
+    if not isinstance(token, str):
+        token = None
+    if db.execute(SQL_DEL_REVIEW, (rid, token or None, client_id or None)).fetchall():
+        invalidate_list_cache()
         return jsonify({'ok': True}), 200
 
+    # nothing deleted: tell missing rows apart from bad credentials
+    if not db.execute(SQL_GET_REVIEW_BY_ID, (rid,)).fetchone():
+        return jsonify({'error': 'not found'}), 404
     return jsonify({'error': 'unauthorized'}), 403
 
+def sweep_captchas():
+    """
+    Background loop: purge expired captchas in one statement every CAPTCHA_SWEEP_INTERVAL.
+    Runs on its own daemon thread, so it gets its own pooled connection.
+    """
+    while True:
+        time.sleep(CAPTCHA_SWEEP_INTERVAL)
+        try:
+            db = get_db()
+            db.execute(SQL_PURGE_CAPTCHAS, (int(time.time()),))
+        except sqlite3.Error as e:
+            print("captcha sweep error:", e)
+
+def close_db(exc=None):
+    # pooled connections stay open for the life of the worker thread
+    pass
+
 def init_reviews(app):
+    if OrjsonProvider is not None:
+        app.json = OrjsonProvider(app)
     app.register_blueprint(bp)
+    app.teardown_appcontext(close_db)
     # initialize DB on app start
     with app.app_context():
         init_db()
+    threading.Thread(target=sweep_captchas, name='captcha-sweep', daemon=True).start()
 PY
 
 ##########
-# app.py (main Flask app)
+# wsgi.py (production entry point)
 ##########
-cat > app.py <<'PY'
-from flask import Flask, render_template, send_from_directory, jsonify
-import os
-
-app = Flask(__name__, static_folder='static', template_folder='templates')
-
-# routes (main site)
-@app.route('/')
-def index():
-    return render_template('index.html', title="AJMAL ADAM Blockchain Research & Technologies")
-
-@app.route('/about')
-def about():
-    return render_template('about.html', title="About | Ajmal Adam")
-
-@app.route('/research')
-def research():
-    return render_template('research.html', title="Research | Ajmal Adam")
+cat > wsgi.py <<'PY'
+# WSGI entry point for production servers, e.g.:
+#   gunicorn -w 4 -k gthread --threads 8 wsgi:application
+from app import app
 
-@app.route('/knowledge')
-def knowledge():
-    return render_template('knowledge.html', title="History of Blockchain | Ajmal Adam")
-
-@app.route('/blockchain-basic')
-def blockchain_basic():
-    return render_template('blockchain_basic.html', title="Blockchain Basic | Ajmal Adam")
-
-@app.route('/contact')
-def contact():
-    return render_template('contact.html', title="Contact | Ajmal Adam")
-
-@app.route('/labs')
-def labs():
-    return render_template('labs.html', title="🧪 Labs | Ajmal Adam Research")
-
-# register reviews API
-try:
-    import reviews_api
-    reviews_api.init_reviews(app)
-except Exception as e:
-    # if initialization fails, still run site; /api/reviews will be unavailable
-    print("reviews_api init error:", e)
-
-if __name__ == '__main__':
-    # development server (bind to all local interfaces)
-    app.run(host='0.0.0.0', port=8080)
+application = app
 PY
 
 ##########
@@ -501,7 +633,7 @@ async function submitReview(){
 /* load reviews */
 async function loadServerReviews(){
   try{
-    const r = await fetch(API_BASE + '?limit=200', {cache:'no-store'});
+    const r = await fetch(API_BASE + '?limit=200', {cache:'no-cache'});
     if(!r.ok) throw new Error('no list');
     const j = await r.json();
     renderReviews(j.reviews || []);
@@ -565,8 +697,7 @@ async function onDeleteClick(ev){
     try{
       const res = await fetch(API_BASE + '/' + encodeURIComponent(id), {
         method: 'DELETE',
-        headers: {'Content-Type':'application/json'},
-        body: JSON.stringify({ delete_token: token })
+        headers: {'X-Delete-Token': token}
       });
       const j = await res.json();
       if(!res.ok){ alert(j.error || 'Delete failed'); return; }
@@ -693,9 +824,22 @@ THTML
 done
 
 ##########
-# run Flask
+# precompress static text assets for nginx gzip_static / brotli_static (see nginx.conf)
+##########
+find static -type f \( -name '*.css' -o -name '*.js' \) | while read -r f; do
+  gzip -k -9 -f "$f"
+  if command -v brotli >/dev/null 2>&1; then brotli -q 11 -f "$f"; fi
+done
+
+##########
+# nginx site config with this checkout's path (install it yourself, e.g. into /etc/nginx/conf.d/)
+##########
+sed "s|__APP_DIR__|$(pwd)|g" nginx.conf > nginx.local.conf
+
+##########
+# run app under gunicorn
 ##########
-echo "Setup complete. Starting Flask (development server) on 0.0.0.0:8080 ..."
-# export FLASK_APP=app.py and run
-export FLASK_APP=app.py
-flask run --host=0.0.0.0 --port=8080
+echo "Setup complete. Starting gunicorn (4 workers x 8 threads) on 127.0.0.1:8080."
+echo "The site is only reachable through nginx: install $(pwd)/nginx.local.conf and make $(pwd) readable by the nginx user."
+# each thread keeps its own SQLite connection (see reviews_api.get_db)
+gunicorn -w 4 -k gthread --threads 8 -b 127.0.0.1:8080 wsgi:application
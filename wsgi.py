@@ -0,0 +1,5 @@
+# WSGI entry point for production servers, e.g.:
+#   gunicorn -w 4 -k gthread --threads 8 wsgi:application
+from app import app
+
+application = app